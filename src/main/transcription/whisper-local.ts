@@ -88,6 +88,8 @@ export class WhisperLocalService extends EventEmitter {
 
               case 'error':
                 this.emit('error', new Error(message.message))
+                // A rejected config never gets a 'ready'; no-op once connect() has resolved
+                resolve(false)
                 break
             }
           } catch (err) {
@@ -107,6 +109,7 @@ export class WhisperLocalService extends EventEmitter {
           console.log(`[whisper-local] WebSocket closed. Code: ${code}, Reason: ${reason}`)
           this.isConnected = false
           this.emit('disconnected')
+          resolve(false)
         })
 
         // Timeout for connection
@@ -130,12 +133,8 @@ export class WhisperLocalService extends EventEmitter {
     }
 
     console.log('Sending audio to Whisper server:', audioData.length, 'bytes')
-    this.ws.send(
-      JSON.stringify({
-        type: 'audio',
-        data: audioData.toString('base64')
-      })
-    )
+    // Raw binary frame; control messages stay JSON
+    this.ws.send(audioData)
   }
 
   async stop(): Promise<void> {
@@ -181,15 +180,24 @@ export class WhisperLocalService extends EventEmitter {
   }
 }
 
+export interface TranscriptSegment {
+  id: number
+  start: number
+  end: number
+  text: string
+  confidence: number
+}
+
 // HTTP client for batch transcription
 export async function transcribeFile(
   audioBuffer: Buffer,
   language = 'en',
-  serverUrl = 'http://127.0.0.1:8765'
+  serverUrl = 'http://127.0.0.1:8765',
+  onSegment?: (segment: TranscriptSegment) => void
 ): Promise<{
   success: boolean
   text: string
-  segments: Array<{ id: number; start: number; end: number; text: string }>
+  segments: TranscriptSegment[]
   language: string
   duration: number
 }> {
@@ -202,11 +210,71 @@ export async function transcribeFile(
     body: formData
   })
 
-  if (!response.ok) {
+  if (!response.ok || !response.body) {
     throw new Error(`Transcription failed: ${response.status}`)
   }
 
-  return response.json()
+  // Server streams NDJSON: an info line, one line per segment, then done
+  const result = {
+    success: false,
+    text: '',
+    segments: [] as TranscriptSegment[],
+    language,
+    duration: 0
+  }
+
+  const handleLine = (line: string): void => {
+    if (!line.trim()) return
+    const message = JSON.parse(line)
+
+    switch (message.type) {
+      case 'info':
+        result.language = message.language
+        result.duration = message.duration
+        break
+
+      case 'segment': {
+        const segment: TranscriptSegment = {
+          id: message.id,
+          start: message.start,
+          end: message.end,
+          text: message.text,
+          confidence: message.confidence
+        }
+        result.segments.push(segment)
+        onSegment?.(segment)
+        break
+      }
+
+      case 'done':
+        result.success = message.success
+        result.text = message.text
+        break
+
+      case 'error':
+        throw new Error(`Transcription failed: ${message.message}`)
+    }
+  }
+
+  // Handle segments as they arrive instead of waiting for the whole file
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffered = ''
+  try {
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffered += decoder.decode(value, { stream: true })
+      const lines = buffered.split('\n')
+      buffered = lines.pop() ?? ''
+      lines.forEach(handleLine)
+    }
+    handleLine(buffered + decoder.decode())
+  } finally {
+    reader.releaseLock()
+  }
+
+  return result
 }
 
 // Check if the Whisper server is running
@@ -4,29 +4,133 @@ Local Whisper transcription server using faster-whisper.
 Provides both HTTP and WebSocket endpoints for real-time transcription.
 """
 
+import gc
 import io
+import importlib.util
 import os
-import tempfile
+import time
+import queue
+import atexit
 import asyncio
-from typing import Optional, List
+import logging
+import logging.handlers
+import subprocess
+import threading
+import collections
+from typing import Optional, List, Tuple, Union, Iterator, Set
 from pathlib import Path
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor
 
+import av
+import numpy as np
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from faster_whisper import WhisperModel
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 import uvicorn
 
-# Thread pool for running blocking transcription
-transcription_executor = ThreadPoolExecutor(max_workers=2)
+# Logging goes through a queue so stdout writes happen on the listener thread,
+# not on the event loop or the transcription worker
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)
+
+log = logging.getLogger("whisper-server")
+log.addHandler(logging.handlers.QueueHandler(log_queue))
+log.setLevel(os.environ.get("WHISPER_LOG_LEVEL", "INFO").upper())
+log.propagate = False
 
 # Configuration
 MODEL_SIZE = os.environ.get("WHISPER_MODEL", "base")  # tiny, base, small, medium, large-v3
 DEVICE = os.environ.get("WHISPER_DEVICE", "auto")  # cpu, cuda, auto
-COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")  # float16, int8, int8_float16
+COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "auto")  # auto, float16, int8, int8_float16, int8_float32
+PIN_CPUS = os.environ.get("WHISPER_PIN_CPUS", "1") == "1"  # Linux only: split cores between event loop and model
+NUM_WORKERS = int(os.environ.get("WHISPER_NUM_WORKERS", "1"))
+INFERENCE_BATCH_SIZE = int(os.environ.get("WHISPER_INFERENCE_BATCH_SIZE", "8"))  # Speech segments decoded per batch
 BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", "3"))  # Number of 1-second chunks before transcription
+OVERLAP_S = float(os.environ.get("WHISPER_OVERLAP_S", "2.5"))  # Seconds of committed audio re-fed for context
+WINDOW_S = float(os.environ.get("WHISPER_WINDOW_S", "60"))  # Seconds of decoded audio kept per stream session
+COMPUTE_PICK_CACHE = Path(os.environ.get("WHISPER_COMPUTE_PICK_CACHE", "/tmp/whisper_compute_pick.json"))
+
 
-app = FastAPI(title="Whisper Transcription Server")
+def split_cores() -> Tuple[Set[int], Set[int]]:
+    """
+    Reserve the first allowed core for the event loop and the rest for
+    transcription. Empty sets mean no pinning (disabled, non-Linux, one core).
+    """
+    if not PIN_CPUS or not hasattr(os, "sched_setaffinity"):
+        return set(), set()
+    cores = sorted(os.sched_getaffinity(0))
+    if len(cores) < 2:
+        return set(), set()
+    return {cores[0]}, set(cores[1:])
+
+
+LOOP_CORES, WORKER_CORES = split_cores()
+CPU_THREADS = int(os.environ.get(
+    "WHISPER_CPU_THREADS",
+    len(WORKER_CORES) or max(1, (os.cpu_count() or 2) // 2),
+))
+
+
+def init_transcription_worker():
+    """Pin the worker (and the CTranslate2 threads it spawns) off the event loop's core."""
+    if WORKER_CORES:
+        os.sched_setaffinity(0, WORKER_CORES)
+    # Deterministic temperature-fallback sampling across restarts
+    ctranslate2.set_random_seed(0)
+
+
+# Single worker for blocking transcription: CTranslate2 already parallelizes
+# each call across cores, so concurrent calls only oversubscribe the CPU
+transcription_executor = ThreadPoolExecutor(max_workers=1, initializer=init_transcription_worker)
+
+SAMPLE_RATE = 16000  # Whisper expects 16kHz mono
+PROMPT_MAX_WORDS = 150  # Roughly 200 tokens of committed text carried as initial_prompt
+CUDA_COMPUTE_CANDIDATES = ("float16", "int8_float16")
+
+# Decoding knobs, built once instead of per request
+# max_speech_duration_s must be given explicitly: the batched pipeline only
+# caps chunks at Whisper's 30s window when vad_parameters is a dict
+VAD_PARAMETERS = VadOptions(min_silence_duration_ms=500, max_speech_duration_s=30)
+# without_timestamps=False: the batched pipeline defaults to True, which
+# returns a single segment per merged VAD chunk (up to 30s) instead of
+# sentence-level segments with real timestamps
+FILE_TRANSCRIBE_KWARGS = {
+    "batch_size": INFERENCE_BATCH_SIZE,
+    "beam_size": 5,
+    "without_timestamps": False,
+    "vad_filter": True,
+    "vad_parameters": VAD_PARAMETERS,
+}
+# Greedy decoding: streaming windows are short, so beam search costs far
+# more than it gains in accuracy
+STREAM_TRANSCRIBE_KWARGS = {
+    "batch_size": INFERENCE_BATCH_SIZE,
+    "beam_size": 1,
+    "without_timestamps": False,
+    "vad_filter": True,
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up on the transcription worker before serving, so the event loop stays free."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(transcription_executor, warm_up)
+    yield
+
+
+app = FastAPI(
+    title="Whisper Transcription Server",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # CORS for Electron app
 app.add_middleware(
@@ -37,43 +141,453 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global model instance
+# Global model instances
 model: Optional[WhisperModel] = None
+batched_model: Optional[BatchedInferencePipeline] = None
+
+
+def resolve_device() -> str:
+    """Turn WHISPER_DEVICE=auto into cuda or cpu."""
+    if DEVICE != "auto":
+        return DEVICE
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def cuda_device_name() -> str:
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader", "-i", "0"],
+            capture_output=True, text=True, timeout=5, check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "cuda"
+    return result.stdout.strip() or "cuda"
+
+
+def build_model(device: str, compute_type: str) -> WhisperModel:
+    log.info("Loading Whisper model: %s on %s with %s (%d CPU threads)", MODEL_SIZE, device, compute_type, CPU_THREADS)
+    return WhisperModel(
+        MODEL_SIZE,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=CPU_THREADS,
+        num_workers=NUM_WORKERS,
+    )
+
+
+def decode_silence(whisper: WhisperModel, seconds: float):
+    """Run a full encoder + decoder pass over silence (VAD off so it isn't skipped)."""
+    segments, _ = whisper.transcribe(
+        np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32),
+        language="en",
+        beam_size=1,
+        vad_filter=False,
+    )
+    list(segments)
+
+
+def benchmark_cuda_model() -> Tuple[str, WhisperModel]:
+    """
+    Time float16 against int8_float16 on this GPU and keep the faster model.
+
+    Which one wins depends on the architecture, so the pick is measured once
+    and cached per GPU and model size in COMPUTE_PICK_CACHE.
+    """
+    key = f"{cuda_device_name()}:{MODEL_SIZE}"
+    try:
+        picks = orjson.loads(COMPUTE_PICK_CACHE.read_bytes())
+    except (OSError, ValueError):
+        picks = {}
+    if not isinstance(picks, dict):
+        picks = {}  # The cache path is world-writable, don't trust its shape
+
+    cached = picks.get(key)
+    if cached in CUDA_COMPUTE_CANDIDATES:
+        log.info("Using cached compute type for %s: %s", key, cached)
+        try:
+            return cached, build_model("cuda", cached)
+        except (RuntimeError, ValueError) as e:
+            log.warning("Cached compute type %s failed to load, benchmarking again: %s", cached, e)
+    elif cached is not None:
+        log.warning("Ignoring unknown cached compute type for %s: %r", key, cached)
+
+    best_type, best_time, best_model = None, None, None
+    for compute_type in CUDA_COMPUTE_CANDIDATES:
+        candidate = None
+        try:
+            candidate = build_model("cuda", compute_type)
+            decode_silence(candidate, 1)  # Untimed run so kernel setup isn't measured
+            start = time.perf_counter()
+            decode_silence(candidate, 10)
+            elapsed = time.perf_counter() - start
+        except (RuntimeError, ValueError) as e:
+            # e.g. out of memory while the previous candidate is still loaded
+            log.warning("Skipping %s: %s", compute_type, e)
+            del candidate
+            gc.collect()
+            continue
+        log.info("Benchmark %s: %.0f ms for 10s of audio", compute_type, elapsed * 1000)
+
+        if best_time is None or elapsed < best_time:
+            best_type, best_time, best_model = compute_type, elapsed, candidate
+        del candidate
+        gc.collect()
+
+    if best_model is None:
+        raise RuntimeError("No CUDA compute type could be loaded")
+
+    picks[key] = best_type
+    try:
+        COMPUTE_PICK_CACHE.write_bytes(orjson.dumps(picks))
+    except OSError as e:
+        log.warning("Could not cache compute type pick: %s", e)
+    return best_type, best_model
 
 
 def get_model() -> WhisperModel:
-    """Lazy load the Whisper model."""
+    """
+    Lazy load the Whisper model.
+
+    With WHISPER_COMPUTE_TYPE=auto, CUDA benchmarks its candidates and CPU
+    uses int8; otherwise the configured type is used.
+    """
     global model
     if model is None:
-        print(f"Loading Whisper model: {MODEL_SIZE} on {DEVICE} with {COMPUTE_TYPE}")
-        model = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE)
-        print("Model loaded successfully")
+        device = resolve_device()
+        if COMPUTE_TYPE != "auto":
+            model = build_model(device, COMPUTE_TYPE)
+        elif device == "cuda":
+            _, model = benchmark_cuda_model()
+        else:
+            model = build_model(device, "int8")
+        log.info("Model loaded successfully")
     return model
 
 
-def transcribe_sync(tmp_path: str, language: str) -> List[str]:
-    """Synchronous transcription - runs in thread pool."""
-    whisper = get_model()
+def get_batched_model() -> BatchedInferencePipeline:
+    """Wrap the model so VAD segments are decoded together in one batch."""
+    global batched_model
+    if batched_model is None:
+        batched_model = BatchedInferencePipeline(model=get_model())
+    return batched_model
+
+
+def resolve_language(language: Optional[str]) -> Optional[str]:
+    """
+    Check a language code once per session, so each batch doesn't redo
+    the check (or log the English-only fallback warning) in faster-whisper.
+    None is passed through so Whisper detects the language itself.
+    """
+    if language is None:
+        return None
+    supported = get_model().supported_languages
+    if language in supported:
+        return language
+    if supported == ["en"]:
+        log.warning("Model %s is English-only, using en instead of %s", MODEL_SIZE, language)
+        return "en"
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def iter_pcm(container: av.container.InputContainer) -> Iterator[np.ndarray]:
+    """Yield 16kHz mono float32 PCM blocks from the container's first audio stream."""
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+
+    for packet in container.demux(container.streams.audio[0]):
+        try:
+            frames = packet.decode()
+        except av.error.InvalidDataError:
+            continue  # Truncated tail of a still-recording WebM stream
+        for frame in frames:
+            for resampled in resampler.resample(frame):
+                yield resampled.to_ndarray().reshape(-1)
+
+    # Flush samples buffered inside the resampler
+    for resampled in resampler.resample(None):
+        yield resampled.to_ndarray().reshape(-1)
+
+
+def decode_to_pcm(data: Union[bytes, bytearray]) -> np.ndarray:
+    """Decode audio bytes (WebM, WAV, MP3, ...) to 16kHz mono float32 PCM in-process."""
+    with av.open(io.BytesIO(data)) as container:
+        chunks = list(iter_pcm(container))
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32, copy=False)
+
+
+class ChunkReader(io.RawIOBase):
+    """Non-seekable file object over byte chunks that blocks until more arrive."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = collections.deque()
+        self._current = memoryview(b"")
+        self._eof = False
+        self._cond = threading.Condition()
+
+    def readable(self) -> bool:
+        return True
+
+    def feed(self, data: bytes):
+        with self._cond:
+            if self._eof:
+                return  # Nothing will read it any more
+            self._chunks.append(data)
+            self._cond.notify()
+
+    def end(self):
+        """Signal that no more chunks will arrive; pending reads then hit EOF."""
+        with self._cond:
+            self._eof = True
+            self._cond.notify()
+
+    def abort(self):
+        """Stop accepting chunks and drop the ones still queued."""
+        with self._cond:
+            self._eof = True
+            self._chunks.clear()
+            self._current = memoryview(b"")
+            self._cond.notify()
+
+    def readinto(self, buf) -> int:
+        with self._cond:
+            while not self._current and not self._chunks:
+                if self._eof:
+                    return 0
+                self._cond.wait()
+            if not self._current:
+                self._current = memoryview(self._chunks.popleft())
+
+        n = min(len(buf), len(self._current))
+        buf[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+
+class StreamDecodeError(Exception):
+    """The session's WebM stream could not be decoded; no more audio will arrive."""
+
+
+class StreamDecoder:
+    """
+    Long-lived WebM demuxer for one /stream session.
+
+    MediaRecorder only puts the WebM header in the first fragment, so instead
+    of re-decoding the whole stream every batch, fragments are fed to a single
+    PyAV container on a background thread that appends PCM as it decodes.
+
+    Only the last WINDOW_S seconds are retained, so memory stays bounded no
+    matter how long the session runs. `base` is the absolute sample index of
+    the first retained sample.
+    """
+
+    def __init__(self):
+        self.reader = ChunkReader()
+        self._window = int(WINDOW_S * SAMPLE_RATE)
+        self._pcm = np.empty(min(30 * SAMPLE_RATE, 2 * self._window), dtype=np.float32)
+        self._samples = 0
+        self._base = 0
+        self._lock = threading.Lock()
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def snapshot(self) -> Tuple[int, np.ndarray]:
+        """(base, retained PCM). Samples in the view are never rewritten."""
+        with self._lock:
+            return self._base, self._pcm[:self._samples]
+
+    def feed(self, data: bytes):
+        self.reader.feed(data)
+
+    def close(self):
+        self.reader.end()
+
+    def finish(self):
+        """Close the input and wait until the remaining fragments are decoded."""
+        self.reader.end()
+        self._thread.join()
+
+    def _append(self, block: np.ndarray):
+        with self._lock:
+            end = self._samples + len(block)
+            if end > len(self._pcm):
+                # Drop audio older than the window and move the rest into a
+                # fresh array (views handed out by snapshot() stay intact).
+                # Capacity grows geometrically up to twice the window, so
+                # appends stay amortized O(1).
+                keep_from = max(0, self._samples - self._window)
+                kept = self._samples - keep_from
+                capacity = max(kept + len(block), min(2 * len(self._pcm), 2 * self._window))
+                fresh = np.empty(capacity, dtype=np.float32)
+                fresh[:kept] = self._pcm[keep_from:self._samples]
+                self._pcm = fresh
+                self._base += keep_from
+                self._samples = kept
+                end = kept + len(block)
+            self._pcm[self._samples:end] = block
+            self._samples = end
+
+    def _run(self):
+        # Started from the event loop, so it would otherwise inherit LOOP_CORES
+        if WORKER_CORES:
+            os.sched_setaffinity(0, WORKER_CORES)
+        try:
+            with av.open(self.reader, format="webm") as container:
+                for block in iter_pcm(container):
+                    self._append(block)
+        except Exception as e:
+            log.error("Stream decoder error: %s", e)
+            self.error = e
+            self.reader.abort()
+
+
+def transcribe_sync(
+    audio: np.ndarray,
+    language: Optional[str],
+    initial_prompt: Optional[str] = None,
+) -> List[Tuple[float, float, str]]:
+    """Synchronous transcription - runs in thread pool. Returns (start, end, text) per segment."""
+    whisper = get_batched_model()
     segments, _ = whisper.transcribe(
-        tmp_path,
+        audio,
         language=language,
-        beam_size=5,
-        vad_filter=True,
+        initial_prompt=initial_prompt,
+        **STREAM_TRANSCRIBE_KWARGS,
     )
-    return [seg.text.strip() for seg in segments if seg.text.strip()]
+    return [(seg.start, seg.end, seg.text.strip()) for seg in segments if seg.text.strip()]
 
 
-async def transcribe_async(tmp_path: str, language: str) -> List[str]:
+def strip_committed_prefix(text: str, committed_tail: str) -> str:
+    """Drop the leading words of `text` that repeat the end of the committed transcript."""
+    words = text.split()
+    tail = committed_tail.split()
+
+    def normalize(word_list: List[str]) -> List[str]:
+        return [w.strip(".,!?;:\"'").lower() for w in word_list]
+
+    for k in range(min(len(words), len(tail)), 0, -1):
+        if normalize(tail[-k:]) == normalize(words[:k]):
+            return " ".join(words[k:])
+    return text
+
+
+class StreamingSession:
+    """
+    Per-connection state for /stream.
+
+    Each batch only transcribes audio after `processed_until_s` (plus OVERLAP_S
+    of context). Segments that end before the overlap margin are committed and
+    never decoded again; later ones are reported as a tentative tail and
+    re-transcribed on the next batch once more audio has arrived.
+    """
+
+    def __init__(self, language: Optional[str] = "en"):
+        self.language = language
+        self.decoder: Optional[StreamDecoder] = None
+        self.processed_until_s = 0.0
+        self.prev_text = ""
+        self.committed: List[str] = []
+
+    def add_chunk(self, data: bytes):
+        # Started on the first chunk so idle connections don't hold a thread
+        if self.decoder is None:
+            self.decoder = StreamDecoder()
+        self.decoder.feed(data)
+
+    def has_audio(self) -> bool:
+        return self.decoder is not None
+
+    def close(self):
+        if self.decoder is not None:
+            self.decoder.close()
+
+    def process(self, final: bool = False) -> str:
+        """Transcribe new audio and return the cumulative transcript. Runs in thread pool."""
+        if final:
+            self.decoder.finish()
+        if self.decoder.error is not None:
+            raise StreamDecodeError(f"Could not decode audio stream: {self.decoder.error}")
+        base, pcm = self.decoder.snapshot()
+        base_s = base / SAMPLE_RATE
+
+        # Anything older than the retained window was evicted by the decoder
+        if self.processed_until_s < base_s:
+            log.warning(
+                "Dropped %.1fs of untranscribed audio evicted from the %ss window",
+                base_s - self.processed_until_s, WINDOW_S,
+            )
+            self.processed_until_s = base_s
+        window_start_s = max(base_s, self.processed_until_s - OVERLAP_S)
+        window = pcm[int((window_start_s - base_s) * SAMPLE_RATE):]
+        new_end_s = base_s + len(pcm) / SAMPLE_RATE
+        # On stop there is no more audio coming, so everything can be committed
+        commit_until_s = new_end_s if final else new_end_s - OVERLAP_S
+
+        # Only wake Whisper when Silero VAD hears speech in the uncommitted audio
+        pending = pcm[int(max(0.0, self.processed_until_s - base_s) * SAMPLE_RATE):]
+        if len(pending) == 0 or not get_speech_timestamps(pending, sampling_rate=SAMPLE_RATE):
+            self.processed_until_s = max(self.processed_until_s, commit_until_s)
+            return " ".join(self.committed)
+
+        segments = transcribe_sync(window, self.language, self.prev_text or None)
+
+        newly_committed: List[str] = []
+        tentative: List[str] = []
+        last_end_s = self.processed_until_s
+        for start, end, text in segments:
+            start += window_start_s
+            end += window_start_s
+            if end <= self.processed_until_s:
+                continue  # Re-decoded overlap, already committed last batch
+            if start < self.processed_until_s:
+                # Straddles the commit point: keep only the words not yet committed
+                stripped = strip_committed_prefix(text, self.prev_text)
+                if stripped == text and (start + end) / 2 < self.processed_until_s:
+                    continue  # Mostly overlap that didn't re-decode word for word
+                text = stripped
+                if not text:
+                    continue
+            if end <= commit_until_s and not tentative:
+                newly_committed.append(text)
+                last_end_s = end
+            else:
+                tentative.append(text)
+
+        if newly_committed:
+            self.committed.extend(newly_committed)
+            self.processed_until_s = last_end_s
+            words = f"{self.prev_text} {' '.join(newly_committed)}".split()
+            self.prev_text = " ".join(words[-PROMPT_MAX_WORDS:])
+        elif not tentative:
+            # No speech past the commit line, nothing to revisit
+            self.processed_until_s = max(self.processed_until_s, commit_until_s)
+
+        return " ".join(self.committed + tentative)
+
+
+async def transcribe_async(session: StreamingSession, final: bool = False) -> str:
     """Run transcription in thread pool to avoid blocking async loop."""
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(
         transcription_executor,
-        transcribe_sync,
-        tmp_path,
-        language
+        session.process,
+        final
     )
 
 
+def warm_up():
+    """Load the model and run a throwaway decode so the first request skips the cold start."""
+    whisper = get_model()
+    get_batched_model()
+    decode_silence(whisper, 1)
+    # Loads the Silero VAD model used to gate streaming batches
+    get_speech_timestamps(np.zeros(SAMPLE_RATE, dtype=np.float32), sampling_rate=SAMPLE_RATE)
+    log.info("Model warmed up")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -84,59 +598,85 @@ async def health_check():
     }
 
 
+def start_file_transcription(content: bytes, language: Optional[str]):
+    """Decode an upload and start the lazy segment generator - runs in thread pool."""
+    audio = decode_to_pcm(content)
+    whisper = get_batched_model()
+    return whisper.transcribe(
+        audio,
+        language=language,
+        **FILE_TRANSCRIBE_KWARGS,
+    )
+
+
+def ndjson_line(obj: dict) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+
+
+async def send_message(websocket: WebSocket, message: dict):
+    """Send a JSON message as a binary frame, encoded with orjson."""
+    await websocket.send_bytes(orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
 @app.post("/transcribe")
 async def transcribe_file(
     file: UploadFile = File(...),
     language: str = "en"
-):
+) -> StreamingResponse:
     """
     Transcribe an uploaded audio file.
     Accepts WAV, MP3, WebM, or any format ffmpeg can decode.
+
+    Streams NDJSON so text arrives as soon as each segment is decoded:
+    an "info" line, one "segment" line per segment, then a "done" line.
     """
+    loop = asyncio.get_event_loop()
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            whisper = get_model()
-            segments_gen, info = whisper.transcribe(
-                tmp_path,
-                language=language if language else None,
-                beam_size=5,
-                vad_filter=True,
-                vad_parameters=dict(min_silence_duration_ms=500),
-            )
+        content = await file.read()
+        segments_gen, info = await loop.run_in_executor(
+            transcription_executor,
+            start_file_transcription,
+            content,
+            language if language else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            result_segments = []
-            full_text = []
+    async def stream_segments():
+        yield ndjson_line({
+            "type": "info",
+            "language": info.language,
+            "duration": info.duration,
+        })
 
-            for segment in segments_gen:
-                result_segments.append({
+        full_text = []
+        try:
+            while True:
+                # Pull each segment on the worker so decoding never blocks the loop
+                segment = await loop.run_in_executor(transcription_executor, next, segments_gen, None)
+                if segment is None:
+                    break
+                full_text.append(segment.text.strip())
+                yield ndjson_line({
+                    "type": "segment",
                     "id": segment.id,
                     "start": segment.start,
                     "end": segment.end,
                     "text": segment.text.strip(),
                     "confidence": segment.avg_logprob,
                 })
-                full_text.append(segment.text.strip())
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield ndjson_line({"type": "error", "message": str(e)})
+            return
 
-            return {
-                "success": True,
-                "language": info.language,
-                "duration": info.duration,
-                "segments": result_segments,
-                "text": " ".join(full_text),
-            }
+        yield ndjson_line({
+            "type": "done",
+            "success": True,
+            "text": " ".join(full_text),
+        })
 
-        finally:
-            # Clean up temp file
-            os.unlink(tmp_path)
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(stream_segments(), media_type="application/x-ndjson")
 
 
 @app.websocket("/stream")
@@ -146,120 +686,116 @@ async def websocket_transcribe(websocket: WebSocket):
 
     Protocol:
     - Client sends: {"type": "config", "language": "en"} to configure
-    - Client sends: {"type": "audio", "data": "<base64 audio>"} for audio chunks
+    - Client sends: binary frames with raw WebM audio chunks
     - Client sends: {"type": "stop"} to end session
-    - Server sends: {"type": "transcript", "text": "..."}
+    - Server sends: {"type": "transcript", "text": "..."} as orjson-encoded binary frames
     """
     await websocket.accept()
-    print("WebSocket client connected")
+    log.info("WebSocket client connected")
 
     # Set keepalive to prevent disconnection during long transcription
     # This is important because transcription can take 5-10 seconds
     websocket.scope["session"] = {"keepalive": True}
 
-    language = "en"
-    audio_buffer = io.BytesIO()
+    session = StreamingSession()
     chunk_count = 0
     total_chunks = 0
 
     try:
         while True:
-            data = await websocket.receive_json()
-            msg_type = data.get("type")
-            print(f"Received message type: {msg_type}")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Audio arrives as binary frames, control messages as JSON text
+            if message.get("bytes") is not None:
+                msg_type = "audio"
+                audio_data = message["bytes"]
+            else:
+                data = orjson.loads(message["text"])
+                msg_type = data.get("type")
+                log.debug("Received message type: %s", msg_type)
 
             if msg_type == "config":
-                language = data.get("language", "en")
-                print(f"Configured: language={language}")
-                await websocket.send_json({"type": "ready"})
+                try:
+                    session.language = resolve_language(data.get("language", "en"))
+                except ValueError as e:
+                    log.warning("Rejected config: %s", e)
+                    await send_message(websocket, {"type": "error", "message": str(e)})
+                    # No "ready" will follow, so don't leave the client waiting on it
+                    await websocket.close(code=1008)
+                    return
+                log.info("Configured: language=%s", session.language)
+                await send_message(websocket, {"type": "ready"})
 
             elif msg_type == "audio":
-                import base64
-                audio_data = base64.b64decode(data.get("data", ""))
-                audio_buffer.write(audio_data)
+                session.add_chunk(audio_data)
                 chunk_count += 1
                 total_chunks += 1
-                print(f"Received audio chunk {total_chunks}, size: {len(audio_data)} bytes")
+                log.debug("Received audio chunk %d, size: %d bytes", total_chunks, len(audio_data))
 
                 # Process every BATCH_SIZE seconds for streaming feedback
-                # Important: We transcribe the ENTIRE accumulated audio, not just the new chunk
-                # This is because MediaRecorder sends WebM fragments, not complete files
+                # Only audio past the last committed segment is transcribed; the
+                # server still sends the cumulative transcript each time
                 if chunk_count >= BATCH_SIZE:
-                    buffer_data = audio_buffer.getvalue()
-
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-                        tmp.write(buffer_data)
-                        tmp_path = tmp.name
-
                     try:
-                        text_parts = await transcribe_async(tmp_path, language)
+                        transcript_text = await transcribe_async(session)
 
-                        if text_parts:
-                            transcript_text = " ".join(text_parts)
-                            print(f"Transcribed ({total_chunks} chunks, {len(buffer_data)} bytes): {transcript_text[:80]}...")
+                        if transcript_text:
+                            log.debug("Transcribed (%d chunks, committed to %.1fs): %s...", total_chunks, session.processed_until_s, transcript_text[-80:])
 
                             # Check if websocket is still connected before sending
                             try:
-                                await websocket.send_json({
+                                await send_message(websocket, {
                                     "type": "transcript",
                                     "text": transcript_text,
                                 })
                             except Exception as send_error:
-                                print(f"Failed to send transcript (client may have disconnected): {send_error}")
+                                log.warning("Failed to send transcript (client may have disconnected): %s", send_error)
                                 # Don't break - client might reconnect or this is temporary
 
+                    except StreamDecodeError:
+                        raise  # No more audio can arrive; reported to the client below
                     except Exception as e:
-                        print(f"Transcription error: {e}")
-                        import traceback
-                        traceback.print_exc()
-
-                    finally:
-                        os.unlink(tmp_path)
+                        log.exception("Transcription error: %s", e)
 
                     # Reset chunk counter but keep accumulating audio
                     chunk_count = 0
 
             elif msg_type == "stop":
-                print("Stop received, processing any remaining audio...")
-
-                # Process any remaining audio in buffer
-                buffer_data = audio_buffer.getvalue()
-                if len(buffer_data) > 0:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-                        tmp.write(buffer_data)
-                        tmp_path = tmp.name
+                log.info("Stop received, processing any remaining audio...")
 
+                # Commit whatever is left after the last batch
+                if session.has_audio():
                     try:
-                        text_parts = await transcribe_async(tmp_path, language)
+                        transcript_text = await transcribe_async(session, final=True)
 
-                        if text_parts:
-                            transcript_text = " ".join(text_parts)
-                            print(f"Final chunk transcribed: {transcript_text[:80]}...")
-                            await websocket.send_json({
+                        if transcript_text:
+                            log.debug("Final chunk transcribed: %s...", transcript_text[-80:])
+                            await send_message(websocket, {
                                 "type": "transcript",
                                 "text": transcript_text,
                             })
 
+                    except StreamDecodeError:
+                        raise
                     except Exception as e:
-                        print(f"Final transcription error: {e}")
+                        log.error("Final transcription error: %s", e)
 
-                    finally:
-                        os.unlink(tmp_path)
-
-                await websocket.send_json({"type": "done"})
-                print("Session complete")
+                await send_message(websocket, {"type": "done"})
+                log.info("Session complete")
                 break
 
     except WebSocketDisconnect:
-        print("Client disconnected")
+        log.info("Client disconnected")
     except Exception as e:
-        print(f"WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("WebSocket error: %s", e)
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await send_message(websocket, {"type": "error", "message": str(e)})
         except:
             pass
+    finally:
+        session.close()
 
 
 def main():
@@ -277,7 +813,26 @@ def main():
 ╚═══════════════════════════════════════════════════════════════╝
     """)
 
-    uvicorn.run(app, host="127.0.0.1", port=8765)
+    # uvloop + httptools cut the per-message overhead of every WS audio frame.
+    # uvloop has no Windows build, so fall back to the stdlib loop there.
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+    # Threads started from here on (including the transcription worker,
+    # which re-pins itself) inherit the event loop's core
+    if LOOP_CORES:
+        os.sched_setaffinity(0, LOOP_CORES)
+        log.info("Event loop pinned to CPU %s, transcription to %d cores", sorted(LOOP_CORES), len(WORKER_CORES))
+    uvicorn.run(
+        app,
+        host="127.0.0.1",
+        port=8765,
+        loop=loop,
+        http="httptools",
+        ws="websockets",
+        # One process on purpose: CTranslate2 has no mmap loading mode, so
+        # every extra worker would hold its own copy of the weights
+        workers=1,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""Tests for the CUDA compute type benchmark and its cached pick."""
+
+import os
+import sys
+
+import orjson
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def fake_cuda(monkeypatch, tmp_path):
+    """Fake model loading: each compute type maps to a model name, or to an exception to raise."""
+    cache = tmp_path / "pick.json"
+    key = f"gpu:{server.MODEL_SIZE}"
+    loaded = []
+    outcomes = {}
+
+    def build_model(device, compute_type):
+        loaded.append(compute_type)
+        outcome = outcomes.get(compute_type, compute_type)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def decode_silence(whisper, seconds):
+        if isinstance(outcomes.get(f"decode:{whisper}"), Exception):
+            raise outcomes[f"decode:{whisper}"]
+
+    monkeypatch.setattr(server, "COMPUTE_PICK_CACHE", cache)
+    monkeypatch.setattr(server, "cuda_device_name", lambda: "gpu")
+    monkeypatch.setattr(server, "build_model", build_model)
+    monkeypatch.setattr(server, "decode_silence", decode_silence)
+    return cache, key, loaded, outcomes
+
+
+def test_unknown_cached_pick_is_benchmarked_again(fake_cuda):
+    cache, key, loaded, _ = fake_cuda
+    cache.write_bytes(orjson.dumps({key: "int4"}))
+
+    compute_type, _ = server.benchmark_cuda_model()
+
+    assert loaded == list(server.CUDA_COMPUTE_CANDIDATES)
+    assert orjson.loads(cache.read_bytes())[key] == compute_type
+
+
+def test_cached_pick_that_fails_to_load_is_benchmarked_again(fake_cuda):
+    cache, key, loaded, outcomes = fake_cuda
+    cache.write_bytes(orjson.dumps({key: "float16"}))
+    outcomes["float16"] = RuntimeError("CUDA failed with error out of memory")
+
+    compute_type, whisper = server.benchmark_cuda_model()
+
+    assert (compute_type, whisper) == ("int8_float16", "int8_float16")
+    assert loaded == ["float16", "float16", "int8_float16"]
+
+
+def test_out_of_memory_while_benchmarking_skips_the_candidate(fake_cuda):
+    _, _, _, outcomes = fake_cuda
+    outcomes["decode:int8_float16"] = RuntimeError("CUDA failed with error out of memory")
+
+    assert server.benchmark_cuda_model() == ("float16", "float16")
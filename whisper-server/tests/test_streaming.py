@@ -0,0 +1,237 @@
+"""Tests for the streaming commit/dedupe logic in StreamingSession.process."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import server  # noqa: E402
+
+SR = server.SAMPLE_RATE
+
+
+class FakeDecoder:
+    """Stands in for StreamDecoder: exposes a growing PCM buffer, optionally windowed."""
+
+    error = None
+
+    def __init__(self, window_s=None):
+        self.total = 0
+        self.window = int(window_s * SR) if window_s else None
+
+    def advance(self, seconds):
+        self.total += int(seconds * SR)
+
+    def snapshot(self):
+        base = max(0, self.total - self.window) if self.window else 0
+        return base, np.zeros(self.total - base, dtype=np.float32)
+
+    def finish(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePipeline:
+    """Stands in for BatchedInferencePipeline and records the kwargs it was called with."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        return iter([SimpleNamespace(start=0.0, end=1.0, text=" hi")]), SimpleNamespace()
+
+
+def make_session(decoder):
+    session = server.StreamingSession("en")
+    session.decoder = decoder
+    return session
+
+
+def sentence_segments(sentences):
+    """Fake transcribe_sync: return the sentences overlapping the window, relative to it."""
+    calls = []
+
+    def transcribe(audio, language, initial_prompt):
+        window_end_s = calls_end[0]
+        window_start_s = window_end_s - len(audio) / SR
+        calls.append((window_start_s, window_end_s))
+        out = []
+        for start, end, text in sentences:
+            if end > window_start_s and start < window_end_s:
+                out.append((max(start, window_start_s) - window_start_s,
+                            min(end, window_end_s) - window_start_s, text))
+        return out
+
+    calls_end = [0.0]
+    return transcribe, calls, calls_end
+
+
+@pytest.fixture(autouse=True)
+def speech_everywhere(monkeypatch):
+    monkeypatch.setattr(server, "get_speech_timestamps", lambda audio, sampling_rate: [{"start": 0}])
+
+
+def run_stream(monkeypatch, sentences, total_s, step_s=1.5, window_s=None):
+    transcribe, calls, calls_end = sentence_segments(sentences)
+    monkeypatch.setattr(server, "transcribe_sync", transcribe)
+    decoder = FakeDecoder(window_s)
+    session = make_session(decoder)
+    elapsed = 0.0
+    while elapsed < total_s:
+        decoder.advance(step_s)
+        elapsed += step_s
+        calls_end[0] = decoder.total / SR
+        session.process()
+    calls_end[0] = decoder.total / SR
+    transcript = session.process(final=True)
+    return session, transcript, calls
+
+
+def test_pipeline_is_asked_for_timestamps(monkeypatch):
+    pipeline = FakePipeline()
+    monkeypatch.setattr(server, "get_batched_model", lambda: pipeline)
+    monkeypatch.setattr(server, "decode_to_pcm", lambda content: np.zeros(SR, dtype=np.float32))
+
+    assert server.transcribe_sync(np.zeros(SR, dtype=np.float32), "en") == [(0.0, 1.0, "hi")]
+    server.start_file_transcription(b"", "en")
+
+    assert [call["without_timestamps"] for call in pipeline.calls] == [False, False]
+
+
+def test_continuous_speech_commits_each_sentence_once(monkeypatch):
+    sentences = [(i * 4.0, i * 4.0 + 3.8, f"sentence{i}.") for i in range(15)]
+    session, transcript, calls = run_stream(monkeypatch, sentences, total_s=60.0)
+
+    assert transcript.split() == [text for _, _, text in sentences]
+    assert session.committed == [text for _, _, text in sentences]
+    # The overlap window keeps moving forward instead of re-decoding everything
+    assert max(end - start for start, end in calls) < 15.0
+
+
+def test_straddling_segment_keeps_only_new_words(monkeypatch):
+    decoder = FakeDecoder()
+    session = make_session(decoder)
+    decoder.advance(6.0)
+    monkeypatch.setattr(server, "transcribe_sync", lambda audio, language, prompt: [(0.0, 3.0, "hello there")])
+    session.process()
+    assert session.committed == ["hello there"]
+
+    # The next decode merges the committed words with new speech into one segment
+    decoder.advance(3.0)
+    window_start_s = session.processed_until_s - server.OVERLAP_S
+    monkeypatch.setattr(
+        server, "transcribe_sync",
+        lambda audio, language, prompt: [(1.0 - window_start_s, 6.0 - window_start_s, "Hello there, general Kenobi.")],
+    )
+    transcript = session.process(final=True)
+
+    assert transcript == "hello there general Kenobi."
+
+
+def test_strip_committed_prefix():
+    assert server.strip_committed_prefix("Hello there, friend", "we said hello there") == "friend"
+    assert server.strip_committed_prefix("something new", "hello there") == "something new"
+    assert server.strip_committed_prefix("hello there", "hello there") == ""
+
+
+def test_silence_skips_whisper(monkeypatch):
+    monkeypatch.setattr(server, "get_speech_timestamps", lambda audio, sampling_rate: [])
+
+    def fail(*args):
+        raise AssertionError("transcribe_sync should not run on silence")
+
+    monkeypatch.setattr(server, "transcribe_sync", fail)
+    decoder = FakeDecoder()
+    session = make_session(decoder)
+    decoder.advance(6.0)
+
+    assert session.process() == ""
+    assert session.processed_until_s == pytest.approx(6.0 - server.OVERLAP_S)
+
+
+def test_sliding_window_does_not_stall(monkeypatch):
+    sentences = [(i * 4.0, i * 4.0 + 3.8, f"sentence{i}.") for i in range(30)]
+    session, transcript, _ = run_stream(monkeypatch, sentences, total_s=120.0, window_s=60.0)
+
+    assert transcript.split() == [text for _, _, text in sentences]
+    assert session.processed_until_s == pytest.approx(119.8, abs=0.5)
+
+
+def test_warns_when_uncommitted_audio_is_evicted(monkeypatch, caplog):
+    monkeypatch.setattr(server, "transcribe_sync", lambda audio, language, prompt: [])
+    monkeypatch.setattr(server.log, "propagate", True)
+    decoder = FakeDecoder(window_s=60.0)
+    session = make_session(decoder)
+    decoder.advance(70.0)
+
+    with caplog.at_level("WARNING", logger="whisper-server"):
+        session.process()
+
+    assert "Dropped 10.0s of untranscribed audio" in caplog.text
+    assert session.processed_until_s >= 10.0
+
+
+def test_language_none_is_left_to_autodetect(monkeypatch):
+    def fail():
+        raise AssertionError("no model needed to pass None through")
+
+    monkeypatch.setattr(server, "get_model", fail)
+
+    assert server.resolve_language(None) is None
+
+
+def test_rejected_config_closes_the_socket(monkeypatch):
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    monkeypatch.setattr(server, "get_model", lambda: SimpleNamespace(supported_languages=["en", "de"]))
+    client = TestClient(server.app)
+
+    with client.websocket_connect("/stream") as ws:
+        ws.send_text('{"type": "config", "language": "xx"}')
+        assert ws.receive_json(mode="binary")["type"] == "error"
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_bytes()
+
+
+def test_undecodable_stream_stops_buffering_and_raises():
+    decoder = server.StreamDecoder()
+    decoder.feed(os.urandom(100_000))
+    decoder.finish()
+
+    assert decoder.error is not None
+    for _ in range(10):
+        decoder.feed(os.urandom(100_000))
+    assert not decoder.reader._chunks
+
+    session = make_session(decoder)
+    with pytest.raises(server.StreamDecodeError):
+        session.process()
+
+
+def test_undecodable_stream_reports_an_error(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(server.app)
+
+    with client.websocket_connect("/stream") as ws:
+        ws.send_bytes(os.urandom(100_000))
+        ws.send_text('{"type": "stop"}')
+        assert ws.receive_json(mode="binary")["type"] == "error"
+
+
+def test_startup_warms_up_the_model(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    warmed = []
+    monkeypatch.setattr(server, "warm_up", lambda: warmed.append(True))
+
+    with TestClient(server.app):
+        assert warmed == [True]